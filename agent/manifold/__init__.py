@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from . import data, portfolio, trading
+from . import api, data, portfolio, trading
 
 __all__ = [
+    "api",
     "data",
     "portfolio",
     "trading",
@@ -0,0 +1,427 @@
+"""Shared request plumbing for the Manifold API helpers."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from email.message import Message
+from typing import Dict, List, Tuple
+
+from agent.manifold.constants import (
+    FETCH_WORKERS,
+    MANIFOLD_API_ROOT,
+    NEGATIVE_CACHE_TTL,
+    RESPONSE_CACHE_TTL,
+)
+
+try:  # pragma: no cover - optional dependency
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - optional dependency
+    from json import loads as _json_loads
+
+USER_AGENT = "AgentTimeBot/1.0 (+https://manifold.markets)"
+REQUEST_TIMEOUT = 10
+MAX_IDLE_CONNECTIONS = max(8, FETCH_WORKERS)
+MAX_CACHED_RESPONSES = 256
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+MAX_RETRY_AFTER = 10.0
+MAX_REDIRECTS = 5
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+NEGATIVE_CACHE_STATUSES = frozenset({404, 410})
+
+_ConnectionKey = Tuple[str, str, int | None]
+
+_idle_connections: Dict[_ConnectionKey, List[http.client.HTTPConnection]] = {}
+_idle_lock = threading.Lock()
+_response_cache: "OrderedDict[str, Tuple[float, int, str, bytes, str | None]]" = OrderedDict()
+_inflight_requests: Dict[str, "Future[Tuple[int, str, Message | None, bytes]]"] = {}
+_cache_lock = threading.Lock()
+
+
+class ManifoldAPIError(RuntimeError):
+    """Raised when the Manifold API answers a request with an error status."""
+
+    def __init__(self, message: str, *, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+def decode_json(body: bytes) -> object:
+    """Decode a JSON response body, using orjson when it is installed."""
+    return _json_loads(body)
+
+
+def request_json(
+    path: str,
+    *,
+    params: dict | None = None,
+    method: str = "GET",
+    body: object | None = None,
+    authenticated: bool = False,
+    cache: bool = True,
+) -> object:
+    """Call a Manifold API endpoint and return its decoded JSON payload.
+
+    Authenticated calls read ``MANIFOLD_API_KEY`` on every request so per-agent keys swapped
+    into the environment are honoured. Error statuses raise ``ManifoldAPIError``.
+    """
+    headers = _auth_headers() if authenticated else {"User-Agent": USER_AGENT, "Accept": "application/json"}
+    data_bytes = None
+    if body is not None:
+        if isinstance(body, (bytes, bytearray)):
+            data_bytes = bytes(body)
+        else:
+            data_bytes = json.dumps(body).encode("utf-8")
+    request = urllib.request.Request(
+        _build_url(path, params),
+        data=data_bytes,
+        headers=headers,
+        method=method.upper(),
+    )
+    try:
+        payload = open_request(request, cache=cache)
+    except urllib.error.HTTPError as exc:
+        detail = _read_error_body(exc)
+        raise ManifoldAPIError(
+            f"Manifold API request failed ({exc.code} {exc.reason}): {detail}",
+            status=exc.code,
+        ) from exc
+    return decode_json(payload)
+
+
+def open_request(
+    request: urllib.request.Request,
+    *,
+    timeout: float = REQUEST_TIMEOUT,
+    cache: bool = False,
+) -> bytes:
+    """Send the request over a pooled keep-alive connection and return the response body.
+
+    GET requests made with ``cache=True`` are answered from an in-memory copy for
+    ``MANIFOLD_CACHE_TTL`` seconds, and concurrent misses for the same URL share one request.
+    Entries are keyed by URL plus a hash of any ``Authorization`` header, so callers using
+    different API keys never see each other's payloads. 404 and 410 answers are replayed for
+    ``MANIFOLD_NEGATIVE_CACHE_TTL`` seconds, while rate limits and server errors are never
+    cached. Expired copies that carried an ``ETag`` are revalidated with ``If-None-Match`` so
+    an unchanged payload costs a bodiless 304. GETs answered with 429, 502, 503, or 504 are
+    retried with exponential backoff, honouring ``Retry-After``; callers coalesced onto a
+    request that failed without an answer send it once more at most. Any other method clears
+    the cache once it completes because it may change markets, bets, or balances. Raises
+    ``urllib.error.HTTPError`` for non-200 responses and ``urllib.error.URLError`` when the
+    connection fails, mirroring ``urllib.request.urlopen``.
+    """
+    url = request.full_url
+    if request.get_method() != "GET":
+        try:
+            return _send(request, timeout=timeout)[0]
+        finally:
+            invalidate_cache()
+    if not cache:
+        return _send_with_retries(request, timeout=timeout)[0]
+    key = _cache_key(request)
+    body = _cached_body(key, url)
+    if body is not None:
+        return body
+    with _cache_lock:
+        pending = _inflight_requests.get(key)
+        owner = pending is None
+        if owner:
+            pending = _inflight_requests[key] = Future()
+    if not owner:
+        try:
+            status, reason, headers, body = pending.result()
+        except Exception:  # noqa: BLE001
+            body = _cached_body(key, url)
+            return body if body is not None else _send(request, timeout=timeout)[0]
+        if status != 200:
+            raise urllib.error.HTTPError(url, status, reason, headers, io.BytesIO(body))
+        return body
+    try:
+        body, etag = _revalidate(key, request, timeout=timeout)
+    except urllib.error.HTTPError as exc:
+        reason, body = str(exc.reason), _drain(exc)
+        if exc.code in NEGATIVE_CACHE_STATUSES:
+            _store_response(key, exc.code, reason, body, ttl=NEGATIVE_CACHE_TTL, pending=pending)
+        pending.set_result((exc.code, reason, exc.headers, body))
+        raise urllib.error.HTTPError(url, exc.code, reason, exc.headers, io.BytesIO(body)) from None
+    except BaseException as exc:
+        pending.set_exception(exc)
+        raise
+    else:
+        _store_response(key, 200, "OK", body, ttl=RESPONSE_CACHE_TTL, etag=etag, pending=pending)
+        pending.set_result((200, "OK", None, body))
+    finally:
+        with _cache_lock:
+            if _inflight_requests.get(key) is pending:
+                del _inflight_requests[key]
+    return body
+
+
+def invalidate_cache(prefix: str = "") -> None:
+    """Drop cached responses whose URL starts with ``prefix`` (everything by default).
+
+    Matching in-flight GETs are detached as well, so a response that was already on the wire
+    when the data changed is neither stored nor shared with later callers.
+    """
+    with _cache_lock:
+        for key in [key for key in _inflight_requests if key.startswith(prefix)]:
+            del _inflight_requests[key]
+        if not prefix:
+            _response_cache.clear()
+            return
+        for key in [key for key in _response_cache if key.startswith(prefix)]:
+            del _response_cache[key]
+
+
+def _build_url(path: str, params: dict | None) -> str:
+    normalized = path if path.startswith("/") else f"/{path}"
+    url = f"{MANIFOLD_API_ROOT}{normalized}"
+    if params:
+        url = f"{url}?{urllib.parse.urlencode(params)}"
+    return url
+
+
+def _auth_headers() -> Dict[str, str]:
+    api_key = os.environ.get("MANIFOLD_API_KEY")
+    if not api_key:
+        raise RuntimeError("Set MANIFOLD_API_KEY to access authenticated Manifold endpoints.")
+    return {
+        "Authorization": f"Key {api_key}",
+        "User-Agent": USER_AGENT,
+        "Accept": "application/json",
+        "Content-Type": "application/json",
+    }
+
+
+def _read_error_body(exc: urllib.error.HTTPError) -> str:
+    try:
+        body = exc.read().decode("utf-8", errors="ignore")
+    except Exception:
+        body = ""
+    return body or "no response body"
+
+
+def _cache_key(request: urllib.request.Request) -> str:
+    credential = request.get_header("Authorization")
+    if not credential:
+        return request.full_url
+    digest = hashlib.sha256(credential.encode("utf-8")).hexdigest()[:16]
+    return f"{request.full_url} {digest}"
+
+
+def _cached_body(key: str, url: str) -> bytes | None:
+    with _cache_lock:
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, status, reason, body, etag = entry
+        if time.monotonic() >= expires_at:
+            if etag is None:
+                del _response_cache[key]
+            return None
+        _response_cache.move_to_end(key)
+    if status != 200:
+        raise urllib.error.HTTPError(url, status, reason, None, io.BytesIO(body))
+    return body
+
+
+def _drain(exc: urllib.error.HTTPError) -> bytes:
+    try:
+        return exc.read()
+    except Exception:  # noqa: BLE001
+        return b""
+
+
+def _store_response(
+    key: str,
+    status: int,
+    reason: str,
+    body: bytes,
+    *,
+    ttl: float,
+    etag: str | None = None,
+    pending: "Future[Tuple[int, str, Message | None, bytes]] | None" = None,
+) -> None:
+    if ttl <= 0:
+        return
+    with _cache_lock:
+        if pending is not None and _inflight_requests.get(key) is not pending:
+            return
+        _response_cache[key] = (time.monotonic() + ttl, status, reason, body, etag)
+        _response_cache.move_to_end(key)
+        while len(_response_cache) > MAX_CACHED_RESPONSES:
+            _response_cache.popitem(last=False)
+
+
+def _revalidate(
+    key: str,
+    request: urllib.request.Request,
+    *,
+    timeout: float,
+) -> Tuple[bytes, str | None]:
+    with _cache_lock:
+        entry = _response_cache.get(key)
+    stale_body, etag = (entry[3], entry[4]) if entry is not None and entry[4] else (None, None)
+    if etag is not None:
+        request.add_header("If-None-Match", etag)
+    try:
+        body, headers = _send_with_retries(request, timeout=timeout)
+    except urllib.error.HTTPError as exc:
+        if exc.code != 304 or stale_body is None:
+            raise
+        return stale_body, etag
+    return body, headers.get("ETag")
+
+
+def _send_with_retries(request: urllib.request.Request, *, timeout: float) -> Tuple[bytes, Message]:
+    for attempt in range(MAX_RETRIES):
+        try:
+            return _send(request, timeout=timeout)
+        except urllib.error.HTTPError as exc:
+            if exc.code not in RETRY_STATUSES:
+                raise
+            delay = max(RETRY_BACKOFF * 2**attempt, _retry_after(exc))
+        time.sleep(delay)
+    return _send(request, timeout=timeout)
+
+
+def _retry_after(exc: urllib.error.HTTPError) -> float:
+    value = exc.headers.get("Retry-After") if exc.headers is not None else None
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _send(
+    request: urllib.request.Request,
+    *,
+    timeout: float,
+    redirects: int = MAX_REDIRECTS,
+) -> Tuple[bytes, Message]:
+    parts = urllib.parse.urlsplit(request.full_url)
+    if parts.scheme not in {"http", "https"} or not parts.hostname or _uses_proxy(parts):
+        return _open_with_urllib(request, timeout=timeout)
+    key: _ConnectionKey = (parts.scheme, parts.hostname, parts.port)
+    target = parts.path or "/"
+    if parts.query:
+        target = f"{target}?{parts.query}"
+    method = request.get_method()
+    headers = dict(request.header_items())
+    headers.setdefault("Accept-Encoding", "gzip")
+    # Only idempotent requests reuse idle sockets, so a stale keep-alive can be retried safely.
+    connection = _checkout(key, timeout) if method == "GET" else None
+    reused = connection is not None
+    while True:
+        if connection is None:
+            connection = _connect(key, timeout)
+        try:
+            connection.request(method, target, body=request.data, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            if (response.getheader("Content-Encoding") or "").lower() == "gzip":
+                body = gzip.decompress(body)
+        except (http.client.HTTPException, OSError, EOFError, zlib.error) as exc:
+            connection.close()
+            if reused:
+                connection, reused = None, False
+                continue
+            raise urllib.error.URLError(exc) from exc
+        break
+    if response.will_close:
+        connection.close()
+    else:
+        _checkin(key, connection)
+    location = response.getheader("Location")
+    if response.status in REDIRECT_STATUSES and location and redirects > 0:
+        target_request = _redirect(request, response.status, location)
+        return _send(target_request, timeout=timeout, redirects=redirects - 1)
+    if response.status != 200:
+        raise urllib.error.HTTPError(
+            request.full_url,
+            response.status,
+            response.reason,
+            response.headers,
+            io.BytesIO(body),
+        )
+    return body, response.headers
+
+
+def _redirect(
+    request: urllib.request.Request,
+    status: int,
+    location: str,
+) -> urllib.request.Request:
+    url = urllib.parse.urljoin(request.full_url, location)
+    headers = dict(request.header_items())
+    if urllib.parse.urlsplit(url).netloc != urllib.parse.urlsplit(request.full_url).netloc:
+        headers.pop("Authorization", None)
+    if status in (307, 308):
+        return urllib.request.Request(url, data=request.data, headers=headers, method=request.get_method())
+    for name in ("Content-length", "Content-type"):
+        headers.pop(name, None)
+    return urllib.request.Request(url, headers=headers, method="GET")
+
+
+def _uses_proxy(parts: urllib.parse.SplitResult) -> bool:
+    if not urllib.request.getproxies().get(parts.scheme):
+        return False
+    return not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def _open_with_urllib(request: urllib.request.Request, *, timeout: float) -> Tuple[bytes, Message]:
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        body = response.read()
+        if response.status != 200:
+            raise urllib.error.HTTPError(
+                url=request.full_url,
+                code=response.status,
+                msg=response.reason,
+                hdrs=response.headers,
+                fp=io.BytesIO(body),
+            )
+        return body, response.headers
+
+
+def _connect(key: _ConnectionKey, timeout: float) -> http.client.HTTPConnection:
+    scheme, host, port = key
+    if scheme == "https":
+        return http.client.HTTPSConnection(host, port, timeout=timeout)
+    return http.client.HTTPConnection(host, port, timeout=timeout)
+
+
+def _checkout(key: _ConnectionKey, timeout: float) -> http.client.HTTPConnection | None:
+    with _idle_lock:
+        pool = _idle_connections.get(key)
+        connection = pool.pop() if pool else None
+    if connection is not None:
+        connection.timeout = timeout
+        if connection.sock is not None:
+            connection.sock.settimeout(timeout)
+    return connection
+
+
+def _checkin(key: _ConnectionKey, connection: http.client.HTTPConnection) -> None:
+    with _idle_lock:
+        pool = _idle_connections.setdefault(key, [])
+        if len(pool) < MAX_IDLE_CONNECTIONS:
+            pool.append(connection)
+            return
+    connection.close()
+
+
+__all__ = ["ManifoldAPIError", "decode_json", "invalidate_cache", "open_request", "request_json"]
@@ -14,9 +14,18 @@ DEFAULT_CUTOFF_MS = int(_year_end.timestamp() * 1000)
 RESOLUTION_CUTOFF_MS = int(os.environ.get("MANIFOLD_MAX_CLOSE_MS", str(DEFAULT_CUTOFF_MS)))
 
 MANIFOLD_API_ROOT = os.environ.get("MANIFOLD_API_ROOT", "https://api.manifold.markets/v0").rstrip("/")
+RESPONSE_CACHE_TTL = float(os.environ.get("MANIFOLD_CACHE_TTL", "30"))
+NEGATIVE_CACHE_TTL = float(os.environ.get("MANIFOLD_NEGATIVE_CACHE_TTL", "60"))
+FETCH_WORKERS = max(1, int(os.environ.get("MANIFOLD_FETCH_WORKERS", "8")))
+
+BINARY_OUTCOME_TYPES = frozenset({"BINARY", "PSEUDO_NUMERIC"})
 
 __all__ = [
+    "BINARY_OUTCOME_TYPES",
+    "FETCH_WORKERS",
     "MANIFOLD_API_ROOT",
     "MAX_API_LIMIT",
+    "NEGATIVE_CACHE_TTL",
     "RESOLUTION_CUTOFF_MS",
+    "RESPONSE_CACHE_TTL",
 ]
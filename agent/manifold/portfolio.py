@@ -3,28 +3,30 @@
 
 from __future__ import annotations
 
-import json
 import os
 import urllib.error
 import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Tuple
 
 import utils.env_loader as env_loader  # noqa: F401
-from agent.manifold.constants import MANIFOLD_API_ROOT, MAX_API_LIMIT
-USER_AGENT = "AgentTimeBot/1.0 (+https://manifold.markets)"
+from agent.manifold.api import ManifoldAPIError, request_json
+from agent.manifold.constants import BINARY_OUTCOME_TYPES, FETCH_WORKERS, MAX_API_LIMIT
+
 DEFAULT_BETS_LIMIT = int(os.environ.get("MANIFOLD_BETS_LIMIT", "500"))
 
 
 def _safe_float(value: object, *, default: Optional[float] = None) -> Optional[float]:
+    if type(value) is float:
+        return value
     try:
         return float(value)
     except (TypeError, ValueError):
         return default
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioPosition:
     """Single Manifold position."""
 
@@ -44,7 +46,7 @@ class PortfolioPosition:
         return price * self.shares
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioSnapshot:
     """Summary of a Manifold account's current exposure."""
 
@@ -74,58 +76,13 @@ def fetch_portfolio_snapshot(_: str | None = None) -> PortfolioSnapshot:
     return snapshot
 
 
-def _auth_headers() -> Dict[str, str]:
-    api_key = os.environ.get("MANIFOLD_API_KEY")
-    if not api_key:
-        raise RuntimeError("Set MANIFOLD_API_KEY before inspecting the portfolio or trading.")
-    return {
-        "Authorization": f"Key {api_key}",
-        "User-Agent": USER_AGENT,
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
+def fetch_cash_balance() -> Optional[float]:
+    """Return the authenticated Manifold user's available Mana balance."""
+    return _safe_float(_fetch_authenticated_user().get("balance"))
 
 
-def _api_request(
-    path: str,
-    *,
-    params: dict | None = None,
-    method: str = "GET",
-    body: object | None = None,
-) -> object:
-    url = _build_url(path, params)
-    headers = _auth_headers()
-    data_bytes = None
-    if body is not None:
-        if isinstance(body, (bytes, bytearray)):
-            data_bytes = bytes(body)
-        else:
-            data_text = json.dumps(body)
-            data_bytes = data_text.encode("utf-8")
-    request = urllib.request.Request(url, data=data_bytes, headers=headers, method=method.upper())
-    try:
-        with urllib.request.urlopen(request, timeout=10) as response:
-            if response.status != 200:
-                raise urllib.error.HTTPError(
-                    url=url,
-                    code=response.status,
-                    msg=response.reason,
-                    hdrs=response.headers,
-                    fp=response,
-                )
-            return json.load(response)
-    except urllib.error.HTTPError as exc:
-        detail = _read_error_body(exc)
-        raise RuntimeError(f"Manifold API request failed ({exc.code} {exc.reason}): {detail}") from exc
-
-
-def _build_url(path: str, params: dict | None) -> str:
-    normalized = path if path.startswith("/") else f"/{path}"
-    query = urllib.parse.urlencode(params or {})
-    url = f"{MANIFOLD_API_ROOT}{normalized}"
-    if query:
-        url = f"{url}?{query}"
-    return url
+def _api_request(path: str, *, params: dict | None = None) -> object:
+    return request_json(path, params=params, authenticated=True, cache=path != "/me")
 
 
 def _fetch_authenticated_user() -> dict:
@@ -154,29 +111,27 @@ def _fetch_user_bets(user_id: str, *, limit: int) -> List[dict]:
 
 
 def _fetch_markets_for_bets(bets: Iterable[dict]) -> Dict[str, dict]:
-    unique_ids: List[str] = []
-    seen: set[str] = set()
-    for bet in bets:
-        market_id = bet.get("contractId")
-        if not isinstance(market_id, str):
-            continue
-        if market_id in seen:
-            continue
-        seen.add(market_id)
-        unique_ids.append(market_id)
+    contract_ids = (bet.get("contractId") for bet in bets)
+    unique_ids = list(dict.fromkeys(mid for mid in contract_ids if isinstance(mid, str)))
     market_map: Dict[str, dict] = {}
-    for market_id in unique_ids:
-        try:
-            payload = _api_request(f"/market/{urllib.parse.quote(market_id, safe='')}")
-        except urllib.error.HTTPError:
-            continue
-        except urllib.error.URLError:
-            continue
-        if isinstance(payload, dict):
-            market_map[market_id] = payload
+    if not unique_ids:
+        return market_map
+    workers = min(FETCH_WORKERS, len(unique_ids))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        payloads = executor.map(_fetch_market_payload, unique_ids)
+        for market_id, payload in zip(unique_ids, payloads):
+            if isinstance(payload, dict):
+                market_map[market_id] = payload
     return market_map
 
 
+def _fetch_market_payload(market_id: str) -> object | None:
+    try:
+        return _api_request(f"/market/{urllib.parse.quote(market_id, safe='')}")
+    except (ManifoldAPIError, urllib.error.URLError):
+        return None
+
+
 def _build_positions(bets: Iterable[dict], markets: Dict[str, dict]) -> List[PortfolioPosition]:
     aggregates: Dict[Tuple[str, str], Dict[str, float | str | dict | None]] = {}
     for bet in bets:
@@ -208,11 +163,9 @@ def _build_positions(bets: Iterable[dict], markets: Dict[str, dict]) -> List[Por
             },
         )
         agg["shares"] = float(agg["shares"]) + shares_delta
-        agg["buy_shares"] = float(agg["buy_shares"])
-        agg["buy_notional"] = float(agg["buy_notional"])
         if amount > 0:
-            agg["buy_shares"] += shares
-            agg["buy_notional"] += amount
+            agg["buy_shares"] = float(agg["buy_shares"]) + shares
+            agg["buy_notional"] = float(agg["buy_notional"]) + amount
     positions: List[PortfolioPosition] = []
     for (market_id, _), agg in aggregates.items():
         shares = float(agg["shares"])
@@ -247,7 +200,7 @@ def _build_positions(bets: Iterable[dict], markets: Dict[str, dict]) -> List[Por
 def _describe_outcome(market: dict, outcome: str, answer_id: object) -> str:
     outcome_type = str(market.get("outcomeType") or "").upper()
     outcome_upper = (outcome or "").strip().upper()
-    if outcome_type in {"BINARY", "PSEUDO_NUMERIC"} and outcome_upper in {"YES", "NO"}:
+    if outcome_type in BINARY_OUTCOME_TYPES and outcome_upper in {"YES", "NO"}:
         return outcome_upper
     if answer_id:
         for answer in market.get("answers") or []:
@@ -261,7 +214,7 @@ def _describe_outcome(market: dict, outcome: str, answer_id: object) -> str:
 def _mark_price(market: dict, outcome_label: str) -> Optional[float]:
     outcome_type = str(market.get("outcomeType") or "").upper()
     probability = _safe_float(market.get("probability"))
-    if outcome_type in {"BINARY", "PSEUDO_NUMERIC"} and probability is not None:
+    if outcome_type in BINARY_OUTCOME_TYPES and probability is not None:
         prob = max(min(probability, 1.0), 0.0)
         if outcome_label.strip().upper() == "YES":
             return prob
@@ -277,12 +230,5 @@ def _mark_price(market: dict, outcome_label: str) -> Optional[float]:
     return probability
 
 
-__all__ = ["PortfolioPosition", "PortfolioSnapshot", "fetch_portfolio_snapshot"]
-
+__all__ = ["PortfolioPosition", "PortfolioSnapshot", "fetch_cash_balance", "fetch_portfolio_snapshot"]
 
-def _read_error_body(exc: urllib.error.HTTPError) -> str:
-    try:
-        body = exc.read().decode("utf-8", errors="ignore")
-    except Exception:
-        body = ""
-    return body or "no response body"
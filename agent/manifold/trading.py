@@ -2,21 +2,16 @@
 
 from __future__ import annotations
 
-import json
-import os
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
 import utils.env_loader as env_loader  # noqa: F401
-from agent.manifold.constants import MANIFOLD_API_ROOT, RESOLUTION_CUTOFF_MS
+from agent.manifold.api import ManifoldAPIError, request_json
+from agent.manifold.constants import BINARY_OUTCOME_TYPES, RESOLUTION_CUTOFF_MS
 
-USER_AGENT = "AgentTimeBot/1.0 (+https://manifold.markets)"
 
-
-@dataclass
+@dataclass(slots=True)
 class OutcomeOption:
     """Available outcome option for a Manifold market."""
 
@@ -26,7 +21,7 @@ class OutcomeOption:
     answer_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketDetails:
     """Summary metadata for a Manifold market."""
 
@@ -37,10 +32,9 @@ class MarketDetails:
     outcome_type: str
     answers: List[OutcomeOption]
     close_time: Optional[int]
-    raw: Dict[str, object]
 
 
-@dataclass
+@dataclass(slots=True)
 class BetReceipt:
     """Summary of a submitted bet."""
 
@@ -62,7 +56,7 @@ def fetch_market_details(identifier: str) -> MarketDetails:
     outcome_type = str(payload.get("outcomeType") or payload.get("mechanism") or "").upper()
     answers: List[OutcomeOption] = []
     probability = payload.get("probability")
-    if outcome_type in {"BINARY", "PSEUDO_NUMERIC"}:
+    if outcome_type in BINARY_OUTCOME_TYPES:
         try:
             prob = float(probability)
         except (TypeError, ValueError):
@@ -101,7 +95,6 @@ def fetch_market_details(identifier: str) -> MarketDetails:
         outcome_type=outcome_type,
         answers=answers,
         close_time=close_time_ms,
-        raw=payload,
     )
 
 
@@ -177,7 +170,9 @@ def _fetch_market_payload(identifier: str) -> Dict[str, object]:
     for path in candidates:
         try:
             payload = _api_request(path)
-        except urllib.error.HTTPError as exc:
+        except ManifoldAPIError as exc:
+            if exc.status not in (400, 404):
+                raise
             last_error = exc
             continue
         if isinstance(payload, dict) and payload.get("id"):
@@ -188,55 +183,7 @@ def _fetch_market_payload(identifier: str) -> Dict[str, object]:
 
 
 def _api_request(path: str, *, method: str = "GET", body: object | None = None) -> object:
-    url = _build_url(path)
-    headers = _auth_headers()
-    data_bytes = None
-    if body is not None:
-        if isinstance(body, (bytes, bytearray)):
-            data_bytes = bytes(body)
-        else:
-            data_text = json.dumps(body)
-            data_bytes = data_text.encode("utf-8")
-    request = urllib.request.Request(url, data=data_bytes, headers=headers, method=method.upper())
-    try:
-        with urllib.request.urlopen(request, timeout=10) as response:
-            if response.status != 200:
-                raise urllib.error.HTTPError(
-                    url=url,
-                    code=response.status,
-                    msg=response.reason,
-                    hdrs=response.headers,
-                    fp=response,
-                )
-            return json.load(response)
-    except urllib.error.HTTPError as exc:
-        detail = _read_error_body(exc)
-        raise RuntimeError(f"Manifold API request failed ({exc.code} {exc.reason}): {detail}") from exc
-
-
-def _build_url(path: str) -> str:
-    normalized = path if path.startswith("/") else f"/{path}"
-    return f"{MANIFOLD_API_ROOT}{normalized}"
-
-
-def _auth_headers() -> Dict[str, str]:
-    api_key = os.environ.get("MANIFOLD_API_KEY")
-    if not api_key:
-        raise RuntimeError("Set MANIFOLD_API_KEY to access authenticated Manifold endpoints.")
-    return {
-        "Authorization": f"Key {api_key}",
-        "User-Agent": USER_AGENT,
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-    }
-
-
-def _read_error_body(exc: urllib.error.HTTPError) -> str:
-    try:
-        body = exc.read().decode("utf-8", errors="ignore")
-    except Exception:
-        body = ""
-    return body or "no response body"
+    return request_json(path, method=method, body=body, authenticated=True)
 
 
 __all__ = [
@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import os
 import textwrap
+from functools import lru_cache
 from typing import Any, Dict
 
 import utils.env_loader as env_loader  # noqa: F401
@@ -28,9 +29,20 @@ DEFAULT_INSTRUCTION = os.environ.get(
 )
 
 
+_PROVIDER_ALIASES = {
+    "openai": "openai",
+    "gpt": "openai",
+    "chatgpt": "openai",
+    "anthropic": "anthropic",
+    "claude": "anthropic",
+    "google": "google",
+    "gemini": "google",
+}
+
+
 def _build_llm(model: str, temperature: float, provider: str):
-    normalized = provider.lower()
-    if normalized in {"openai", "gpt", "chatgpt"}:
+    normalized = _PROVIDER_ALIASES.get(provider.lower())
+    if normalized == "openai":
         try:
             from langchain_openai import ChatOpenAI
         except ImportError as exc:  # pragma: no cover - optional dependency
@@ -39,7 +51,7 @@ def _build_llm(model: str, temperature: float, provider: str):
                 "and ensure you are using an OpenAI Python package version supported by LangChain."
             ) from exc
         return ChatOpenAI(model=model, temperature=temperature)
-    if normalized in {"anthropic", "claude"}:
+    if normalized == "anthropic":
         try:
             from langchain_anthropic import ChatAnthropic
         except ImportError as exc:  # pragma: no cover - optional dependency
@@ -47,7 +59,7 @@ def _build_llm(model: str, temperature: float, provider: str):
                 "langchain-anthropic is not installed. Install it with `pip install langchain-anthropic`."
             ) from exc
         return ChatAnthropic(model=model, temperature=temperature)
-    if normalized in {"google", "gemini"}:
+    if normalized == "google":
         try:
             from langchain_google_genai import ChatGoogleGenerativeAI
         except ImportError as exc:  # pragma: no cover - optional dependency
@@ -58,6 +70,7 @@ def _build_llm(model: str, temperature: float, provider: str):
     raise ValueError(f"Unsupported LLM provider '{provider}'.")
 
 
+@lru_cache(maxsize=1)
 def _build_prompt() -> ChatPromptTemplate:
     system_message = textwrap.dedent(
         """
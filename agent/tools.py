@@ -3,19 +3,32 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Iterable, List, Optional
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
 
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain_core.tools import StructuredTool
 
-from agent.manifold.constants import RESOLUTION_CUTOFF_MS
+from agent.manifold.constants import BINARY_OUTCOME_TYPES, RESOLUTION_CUTOFF_MS
 from agent.manifold.data import EventSummary, MarketSummary, load_open_markets
-from agent.manifold.portfolio import PortfolioSnapshot, PortfolioPosition, fetch_portfolio_snapshot
-from agent.manifold.trading import MarketDetails, fetch_market_details, lookup_answer_id, place_bet
+from agent.manifold.portfolio import (
+    PortfolioPosition,
+    PortfolioSnapshot,
+    fetch_cash_balance,
+    fetch_portfolio_snapshot,
+)
+from agent.manifold.trading import (
+    MarketDetails,
+    OutcomeOption,
+    fetch_market_details,
+    lookup_answer_id,
+    place_bet,
+)
 
 try:  # pragma: no cover - optional dependency
-    from agent.web.web_search import WebSearchUnavailable, search_web
+    from agent.web.web_search import SearchResult, WebSearchUnavailable, search_web
 except Exception:  # pragma: no cover - optional dependency
+    SearchResult = None  # type: ignore[assignment]
     WebSearchUnavailable = None  # type: ignore[assignment]
     search_web = None  # type: ignore[assignment]
 
@@ -81,22 +94,18 @@ class SearchInput(BaseModel):
 
 def _summarize_event(event: EventSummary) -> str:
     """Return a single-line synopsis of an event's key markets."""
-    markets: List[MarketSummary] = event.markets[:5]
-    snippets: List[str] = []
-    for market in markets:
-        odds = ", ".join(
-            f"{outcome.name} {outcome.price * 100:.1f}%"
-            for outcome in market.outcomes[:4]
-        )
-        if len(market.outcomes) > 4:
-            odds += ", ..."
-        id_note = f"(id: {market.market_id})" if market.market_id else ""
-        snippets.append(f"{market.question} {id_note}: {odds}")
+    markets: Tuple[MarketSummary, ...] = event.markets[:5]
     extra = len(event.markets) - len(markets)
     extra_note = f" (+{extra} more markets)" if extra > 0 else ""
     tag_note = f" Tags: {', '.join(event.tags)}." if event.tags else ""
     url_note = f" URL: {event.url}." if event.url else ""
-    return f"{event.title}{extra_note}{tag_note}{url_note}\n" + "\n".join(f"  - {line}" for line in snippets)
+    lines = [f"{event.title}{extra_note}{tag_note}{url_note}"]
+    for market in markets:
+        odds = ", ".join(f"{outcome.name} {outcome.price * 100:.1f}%" for outcome in market.outcomes[:4])
+        more_note = ", ..." if len(market.outcomes) > 4 else ""
+        id_note = f"(id: {market.market_id})" if market.market_id else ""
+        lines.append(f"  - {market.question} {id_note}: {odds}{more_note}")
+    return "\n".join(lines)
 
 
 def _summarize_events(events: Iterable[EventSummary]) -> str:
@@ -105,22 +114,23 @@ def _summarize_events(events: Iterable[EventSummary]) -> str:
 
 
 def _summarize_position(position: PortfolioPosition) -> str:
-    details = f"{position.shares:.2f} shares"
-    mark_price = position.mark_price if position.mark_price is not None else position.avg_price
-    if mark_price is not None:
-        details += f" @ {mark_price * 100:.2f}%"
+    avg_price = position.avg_price
+    mark_price = position.mark_price
+    parts = [f"- {position.question} [{position.outcome}] {position.shares:.2f} shares"]
+    price = mark_price if mark_price is not None else avg_price
+    if price is not None:
+        parts.append(f" @ {price * 100:.2f}%")
     value = position.estimated_value()
     if value is not None:
-        details += f" (~${value:,.2f})"
+        parts.append(f" (~${value:,.2f})")
     deltas = []
-    if position.avg_price is not None and position.mark_price is not None:
-        delta = (position.mark_price - position.avg_price) * 100
-        deltas.append(f"Δpx {delta:+.2f}pp")
+    if avg_price is not None and mark_price is not None:
+        deltas.append(f"Δpx {(mark_price - avg_price) * 100:+.2f}pp")
     if position.pnl is not None:
         deltas.append(f"PnL ${position.pnl:+,.2f}")
     if deltas:
-        details += " (" + ", ".join(deltas) + ")"
-    return f"- {position.question} [{position.outcome}] {details}"
+        parts.append(f" ({', '.join(deltas)})")
+    return "".join(parts)
 
 
 def _summarize_portfolio(snapshot: PortfolioSnapshot) -> str:
@@ -141,30 +151,32 @@ def _summarize_portfolio(snapshot: PortfolioSnapshot) -> str:
         lines.append("No open positions.")
     else:
         lines.append("Top positions:")
-        for position in positions:
-            lines.append(f"  {_summarize_position(position)}")
+        lines.extend(f"  {_summarize_position(position)}" for position in positions)
         extra = len(snapshot.positions) - len(positions)
         if extra > 0:
             lines.append(f"  ... plus {extra} additional positions.")
     return "\n".join(lines)
 
 
-def _summarize_search_results(results: List[object]) -> str:
+def _summarize_search_results(results: List[SearchResult]) -> str:
     if not results:
         return "No results."
     lines = []
     for idx, result in enumerate(results, 1):
-        title = getattr(result, "title", "Untitled result")
-        url = getattr(result, "url", "")
-        snippet = getattr(result, "snippet", "")
-        lines.append(f"{idx}. {title}")
-        if url:
-            lines.append(f"   {url}")
-        if snippet:
-            lines.append(f"   {snippet}")
+        lines.append(f"{idx}. {result.title}")
+        if result.url:
+            lines.append(f"   {result.url}")
+        if result.snippet:
+            lines.append(f"   {result.snippet}")
     return "\n".join(lines)
 
 
+def _describe_option(option: OutcomeOption) -> str:
+    prob_note = f" ({option.probability * 100:.2f}% implied)" if option.probability is not None else ""
+    answer_note = f" [answerId {option.answer_id}]" if option.answer_id else ""
+    return f"- {option.label}{prob_note}{answer_note}"
+
+
 def _run_fetch_markets(limit: int = 20, offset: int = 0) -> str:
     events = load_open_markets(limit, offset)
     return _summarize_events(events)
@@ -193,12 +205,7 @@ def _run_market_details(market_id: str) -> str:
         lines.append(f"Closes: {close_dt.isoformat()}")
     lines.append(f"Outcome type: {details.outcome_type}")
     lines.append("Available outcomes:")
-    for option in details.answers:
-        prob_note = ""
-        if option.probability is not None:
-            prob_note = f" ({option.probability * 100:.2f}% implied)"
-        answer_note = f" [answerId {option.answer_id}]" if option.answer_id else ""
-        lines.append(f"- {option.label}{prob_note}{answer_note}")
+    lines.extend(_describe_option(option) for option in details.answers)
     lines.append("Use these labels when placing bets.")
     return "\n".join(lines)
 
@@ -218,15 +225,10 @@ def _run_place_bet(
         raise RuntimeError("Cannot trade markets without a close date.")
     if details.close_time > RESOLUTION_CUTOFF_MS:
         raise RuntimeError(f"This market resolves after {CUTOFF_ISO}; choose an earlier market.")
-    snapshot = fetch_portfolio_snapshot(None)
-    if snapshot.cash_balance is not None and amount > snapshot.cash_balance + 1e-6:
-        raise RuntimeError(
-            f"Bet amount {amount:.2f} exceeds available balance {snapshot.cash_balance:.2f}."
-        )
     target_label = outcome.strip()
     answer_id = None
     outcome_type = details.outcome_type.upper()
-    if outcome_type in {"BINARY", "PSEUDO_NUMERIC"}:
+    if outcome_type in BINARY_OUTCOME_TYPES:
         normalized = target_label.upper()
         if normalized not in {"YES", "NO"}:
             raise RuntimeError("Binary markets only accept YES or NO outcomes.")
@@ -252,6 +254,11 @@ def _run_place_bet(
         if not answer_id:
             raise RuntimeError(f"Unable to resolve answer '{lookup_label}'. Call manifold_market_details first.")
         target_label = lookup_label
+    cash_balance = fetch_cash_balance()
+    if cash_balance is not None and amount > cash_balance + 1e-6:
+        raise RuntimeError(
+            f"Bet amount {amount:.2f} exceeds available balance {cash_balance:.2f}."
+        )
     receipt = place_bet(
         market_id=details.market_id,
         outcome=target_label,
@@ -279,6 +286,11 @@ def _run_search(query: str, limit: int = 5) -> str:
 
 def build_agent_tools() -> List[StructuredTool]:
     """Return the list of LangChain tools exposed to the trading agent."""
+    return list(_agent_tools())
+
+
+@lru_cache(maxsize=1)
+def _agent_tools() -> Tuple[StructuredTool, ...]:
     fetch_tool = StructuredTool.from_function(
         name="manifold_markets",
         func=_run_fetch_markets,
@@ -322,7 +334,7 @@ def build_agent_tools() -> List[StructuredTool]:
             args_schema=SearchInput,
         )
         tools.append(search_tool)
-    return tools
+    return tuple(tools)
 
 
 __all__ = [
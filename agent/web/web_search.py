@@ -4,8 +4,11 @@
 from __future__ import annotations
 
 import argparse
+import atexit
 import calendar
+import contextlib
 import os
+import threading
 from dataclasses import dataclass
 from datetime import date
 from typing import Iterable, List, Optional
@@ -22,12 +25,15 @@ except ImportError:  # pragma: no cover - optional dependency
 
 DEFAULT_SEARCH_LIMIT = 5
 
+_ddgs_client = None
+_ddgs_lock = threading.Lock()
+
 
 class WebSearchUnavailable(RuntimeError):
     """Raised when the duckduckgo_search dependency is missing."""
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     """Single search result snippet."""
 
@@ -64,8 +70,18 @@ def _resolve_timelimit() -> Optional[str]:
     return f"{start.isoformat()}..{today.isoformat()}"
 
 
-def search_web(query: str, *, max_results: int = DEFAULT_SEARCH_LIMIT, region: str = "wt-wt") -> List[SearchResult]:
-    """Return DuckDuckGo text search results for the query."""
+def search_web(
+    query: str,
+    *,
+    max_results: int = DEFAULT_SEARCH_LIMIT,
+    region: str = "wt-wt",
+    ddgs: DDGS | None = None,
+) -> List[SearchResult]:
+    """Return DuckDuckGo text search results for the query.
+
+    Pass ``ddgs`` to search with a caller-owned client; otherwise a process-wide client is
+    reused and replaced after a failed search.
+    """
     query = (query or "").strip()
     if not query:
         return []
@@ -75,23 +91,52 @@ def search_web(query: str, *, max_results: int = DEFAULT_SEARCH_LIMIT, region: s
         )
     max_results = max(1, min(max_results, 25))
     timelimit = _resolve_timelimit()
-    with DDGS(timeout=10) as ddgs:
-        raw_results: Iterable[dict] = ddgs.text(
-            query,
-            region=region,
-            safesearch="moderate",
-            timelimit=timelimit,
-            max_results=max_results,
+    client = ddgs if ddgs is not None else _shared_client()
+    try:
+        raw_results: Iterable[dict] = list(
+            client.text(
+                query,
+                region=region,
+                safesearch="moderate",
+                timelimit=timelimit,
+                max_results=max_results,
+            )
+            or []
         )
-        normalized: List[SearchResult] = []
-        for entry in raw_results:
-            if not isinstance(entry, dict):
-                continue
-            title = str(entry.get("title") or entry.get("heading") or "Untitled result")
-            url = str(entry.get("href") or entry.get("url") or "")
-            snippet = str(entry.get("body") or entry.get("snippet") or "")
-            normalized.append(SearchResult(title=title, url=url, snippet=snippet))
-        return normalized
+    except Exception:
+        if ddgs is None:
+            _close_shared_client(client)
+        raise
+    normalized: List[SearchResult] = []
+    for entry in raw_results:
+        if not isinstance(entry, dict):
+            continue
+        title = str(entry.get("title") or entry.get("heading") or "Untitled result")
+        url = str(entry.get("href") or entry.get("url") or "")
+        snippet = str(entry.get("body") or entry.get("snippet") or "")
+        normalized.append(SearchResult(title=title, url=url, snippet=snippet))
+    return normalized
+
+
+def _shared_client() -> DDGS:
+    global _ddgs_client
+    with _ddgs_lock:
+        if _ddgs_client is None:
+            _ddgs_client = DDGS(timeout=10)
+        return _ddgs_client
+
+
+def _close_shared_client(client: DDGS | None = None) -> None:
+    global _ddgs_client
+    with _ddgs_lock:
+        if _ddgs_client is None or (client is not None and client is not _ddgs_client):
+            return
+        client, _ddgs_client = _ddgs_client, None
+    with contextlib.suppress(Exception), contextlib.closing(client):
+        pass
+
+
+atexit.register(_close_shared_client)
 
 
 def _print_results(results: List[SearchResult]) -> None:
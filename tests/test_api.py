@@ -0,0 +1,108 @@
+import gzip
+import json
+import threading
+import unittest
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agent.manifold import api
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self.server.requests.append((self.command, self.path, self.client_address))
+        if self.path == "/moved":
+            self._reply(302, b"", Location="/target")
+            return
+        body = json.dumps({"path": self.path}).encode("utf-8")
+        if self.path == "/gzip" and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            self._reply(200, gzip.compress(body), **{"Content-Encoding": "gzip"})
+            return
+        self._reply(200, body)
+        if self.path == "/drop":
+            # Keep-alive was advertised, but the socket is closed anyway, leaving the
+            # client with a stale pooled connection.
+            self.close_connection = True
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.requests.append((self.command, self.path, self.client_address))
+        self._reply(303, b"", Location="/target")
+
+    def _reply(self, status: int, body: bytes, **headers: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class OpenRequestTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.requests = []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.addCleanup(self._close_pool)
+        self.root = f"http://127.0.0.1:{self.server.server_port}"
+
+    def _close_pool(self) -> None:
+        with api._idle_lock:
+            pools = list(api._idle_connections.values())
+            api._idle_connections.clear()
+        for pool in pools:
+            for connection in pool:
+                connection.close()
+
+    def _get(self, path: str) -> object:
+        request = urllib.request.Request(f"{self.root}{path}", method="GET")
+        return json.loads(api.open_request(request))
+
+    def _clients(self) -> set:
+        return {client for _, _, client in self.server.requests}
+
+    def test_reuses_pooled_connection(self) -> None:
+        self.assertEqual(self._get("/one"), {"path": "/one"})
+        self.assertEqual(self._get("/two"), {"path": "/two"})
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(len(self._clients()), 1)
+
+    def test_follows_redirect_on_pooled_connection(self) -> None:
+        self.assertEqual(self._get("/moved"), {"path": "/target"})
+        self.assertEqual([path for _, path, _ in self.server.requests], ["/moved", "/target"])
+        self.assertEqual(len(self._clients()), 1)
+
+    def test_see_other_turns_post_into_get(self) -> None:
+        request = urllib.request.Request(
+            f"{self.root}/bet",
+            data=b"{}",
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        self.assertEqual(json.loads(api.open_request(request)), {"path": "/target"})
+        self.assertEqual(
+            [(method, path) for method, path, _ in self.server.requests],
+            [("POST", "/bet"), ("GET", "/target")],
+        )
+
+    def test_decodes_gzip_bodies(self) -> None:
+        self.assertEqual(self._get("/gzip"), {"path": "/gzip"})
+
+    def test_replays_request_on_stale_socket(self) -> None:
+        self.assertEqual(self._get("/drop"), {"path": "/drop"})
+        self.assertEqual(self._get("/after"), {"path": "/after"})
+        self.assertEqual([path for _, path, _ in self.server.requests], ["/drop", "/after"])
+        self.assertEqual(len(self._clients()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()